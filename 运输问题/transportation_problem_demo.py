@@ -16,22 +16,57 @@ Transportation Problem Optimization Demo
 """
 
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pulp
+from scipy.optimize import linprog
+from scipy.sparse import csr_matrix
 import warnings
 # 抑制非关键警告，保证教学输出清爽
 warnings.filterwarnings('ignore')
 
-# 路径与中文字体：移动到子目录后也能导入根目录的配置
+# 路径配置：移动到子目录后也能导入根目录的模块
+# （matplotlib与中文字体配置延迟到可视化时再加载，降低冷启动开销；
+# font_config顶层就import matplotlib，因此也必须随之延迟导入）
 import os, sys
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(BASE_DIR)
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
-from font_config import setup_chinese_font
-setup_chinese_font()
+
+
+def _format_matrix(mat, row_labels, col_labels, fmt='{:.0f}'):
+    """把矩阵排版成带行列标签的对齐文本
+    作用：纯打印场景不必为排版构造DataFrame（块管理器开销大），
+    这里用字符串拼接生成与pandas一致的右对齐表格。
+    参数：fmt 为单元格格式（成本用'{:.0f}'，运量用'{:.1f}'）。
+    """
+    cells = [[fmt.format(v) for v in row] for row in mat]
+    widths = [max(len(col), max(len(row[j]) for row in cells))
+              for j, col in enumerate(col_labels)]
+    idx_width = max(len(label) for label in row_labels)
+    lines = [' ' * idx_width + ''.join('  ' + col.rjust(w)
+                                       for col, w in zip(col_labels, widths))]
+    for label, row in zip(row_labels, cells):
+        lines.append(label.ljust(idx_width)
+                     + ''.join('  ' + cell.rjust(w)
+                               for cell, w in zip(row, widths)))
+    return '\n'.join(lines)
+
+def _build_transport_lp(cost_matrix, supply, demand):
+    """把平衡运输问题写成等式形式的线性规划
+    作用：运输问题是完全单模结构的LP，直接交给scipy的HiGHS在进程内
+    求解即可得到整数最优解，无需通用建模层与求解器子进程。
+    返回：(目标系数c, 稀疏等式矩阵A_eq, 右端b_eq)，
+    变量按行优先展平（x[i,j] → 下标 i*n+j），供敏感性分析复用。
+    """
+    m, n = cost_matrix.shape
+    c = cost_matrix.astype(np.float64).ravel()
+    # 供应行：第i行对 x[i,:] 求和；需求行：第m+j行对 x[:,j] 求和
+    row_idx = np.concatenate([np.repeat(np.arange(m), n),
+                              m + np.tile(np.arange(n), m)])
+    col_idx = np.concatenate([np.arange(m * n), np.arange(m * n)])
+    A_eq = csr_matrix((np.ones(2 * m * n), (row_idx, col_idx)),
+                      shape=(m + n, m * n))
+    b_eq = np.concatenate([supply, demand]).astype(np.float64)
+    return c, A_eq, b_eq
 
 class TransportationProblemDemo:
     """运输问题演示类
@@ -39,6 +74,9 @@ class TransportationProblemDemo:
     设计：面向对象组织流程；共享结果通过 self.results 以便各方法复用。
     """
     
+    # 中文字体只需配置一次（首次绘图时），用类级标志避免重复扫描
+    _font_ready = False
+    
     def __init__(self):
         self.results = {}
         print("=" * 50)
@@ -51,14 +89,13 @@ class TransportationProblemDemo:
         
         作用：构建并求解经典运输问题（平衡或通过虚拟节点平衡），最小化运输成本。
         语法要点：
-        - LpProblem(name, LpMinimize)
-        - LpVariable(f"x_{i}_{j}", lowBound=0) 连续非负变量表示从工厂i到仓库j的运输量
-        - 目标：Σ c_ij x_ij；约束：每个工厂的供应等式、每个仓库的需求等式
+        - scipy.optimize.linprog(method='highs')：进程内求解，无子进程与临时文件
+        - 等式形式：目标 Σ c_ij x_ij；每个工厂的供应等式、每个仓库的需求等式
         - 非平衡时添加“虚拟工厂/虚拟仓库”，成本为0以吸收差额
-        原理：线性规划的特殊结构（完全单调矩阵），可用运输单纯形法；此处用CBC求解器。
+        原理：线性规划的特殊结构（完全单模矩阵）保证单纯形法给出整数最优解，
+        相当于在通用LP框架内执行运输单纯形。
         """
-        print("\n基础运输问题 - 供应链优化")
-        print("-" * 40)
+        lines = ["\n基础运输问题 - 供应链优化", "-" * 40]
         
         # 工厂和仓库
         factories = ['工厂A', '工厂B', '工厂C']
@@ -77,94 +114,81 @@ class TransportationProblemDemo:
             [14, 9, 16, 5]   # 工厂C到各仓库
         ])
         
-        print("供需信息：")
-        print(f"工厂供应量: {dict(zip(factories, supply))}")
-        print(f"仓库需求量: {dict(zip(warehouses, demand))}")
-        print(f"总供应量: {sum(supply)} 吨")
-        print(f"总需求量: {sum(demand)} 吨")
+        # 供需总量只求和一次，平衡检查与打印共用
+        total_supply, total_demand = sum(supply), sum(demand)
+        
+        lines.append("供需信息：")
+        lines.append(f"工厂供应量: {dict(zip(factories, supply))}")
+        lines.append(f"仓库需求量: {dict(zip(warehouses, demand))}")
+        lines.append(f"总供应量: {total_supply} 吨")
+        lines.append(f"总需求量: {total_demand} 吨")
 
-        print("\n运输成本矩阵（元/吨）：")
-        cost_df = pd.DataFrame(cost_matrix, index=factories, columns=warehouses)
-        print(cost_df)
+        lines.append("\n运输成本矩阵（元/吨）：")
+        lines.append(_format_matrix(cost_matrix, factories, warehouses))
         
         # 检查平衡性：供应 ≠ 需求时增加虚拟节点以形成平衡问题
         original_warehouses = warehouses.copy()
         original_demand = demand.copy()
         
-        if sum(supply) != sum(demand):
-            print("非平衡运输问题：供应量 ≠ 需求量")
-            if sum(supply) > sum(demand):
+        if total_supply != total_demand:
+            lines.append("非平衡运输问题：供应量 ≠ 需求量")
+            # 按平衡后的最终规模一次性分配补零矩阵再切片赋值，
+            # 避免column_stack/vstack整矩阵重分配与拷贝
+            if total_supply > total_demand:
                 # 添加虚拟仓库
-                demand.append(sum(supply) - sum(demand))
+                padded = np.zeros((len(factories), len(warehouses) + 1))
+                padded[:, :len(warehouses)] = cost_matrix
+                cost_matrix = padded
+                demand.append(total_supply - total_demand)
                 warehouses.append('虚拟仓库')
-                cost_matrix = np.column_stack([cost_matrix, np.zeros(3)])
-                print(f"添加虚拟仓库，需求量: {demand[-1]} 吨")
+                lines.append(f"添加虚拟仓库，需求量: {demand[-1]} 吨")
             else:
                 # 添加虚拟工厂
-                supply.append(sum(demand) - sum(supply))
+                padded = np.zeros((len(factories) + 1, len(warehouses)))
+                padded[:len(factories), :] = cost_matrix
+                cost_matrix = padded
+                supply.append(total_demand - total_supply)
                 factories.append('虚拟工厂')
-                cost_matrix = np.vstack([cost_matrix, np.zeros(len(warehouses))])
-                print(f"添加虚拟工厂，供应量: {supply[-1]} 吨")
+                lines.append(f"添加虚拟工厂，供应量: {supply[-1]} 吨")
         
-        # 使用PuLP定义优化问题：最小化总运输成本
-        prob = pulp.LpProblem("运输问题", pulp.LpMinimize)
+        # 运输问题的约束矩阵完全单模，平衡化后直接用scipy的HiGHS
+        # 在进程内求解：免去PuLP建模层与求解器子进程的全部开销，
+        # 且单纯形法在整数供需下必然返回整数最优解
+        c, A_eq, b_eq = _build_transport_lp(cost_matrix, supply, demand)
+        res = linprog(c, A_eq=A_eq, b_eq=b_eq, method='highs')
         
-        # 决策变量：从工厂i到仓库j的运输量（非负连续）
-        x = {}
-        for i in range(len(factories)):
-            for j in range(len(warehouses)):
-                x[i,j] = pulp.LpVariable(f"x_{i}_{j}", lowBound=0)
+        # 结果：解向量按行优先还原为运输矩阵，
+        # 路线成本用矩阵元素积一次算完，替代逐格乘法循环
+        solution_matrix = res.x.reshape(cost_matrix.shape)
+        route_cost_matrix = solution_matrix * cost_matrix
         
-        # 目标函数：最小化运输成本 Σ c_ij x_ij
-        prob += pulp.lpSum([cost_matrix[i][j] * x[i,j] 
-                           for i in range(len(factories)) 
-                           for j in range(len(warehouses))])
+        min_transport_cost = res.fun
         
-        # 约束条件：
-        # 1) 供应约束（每个工厂的发货量等于其供应）
-        for i in range(len(factories)):
-            prob += pulp.lpSum([x[i,j] for j in range(len(warehouses))]) == supply[i]
+        lines.append("\n最优运输方案：")
+        lines.append(_format_matrix(solution_matrix, factories, warehouses,
+                                    fmt='{:.1f}'))
         
-        # 2) 需求约束（每个仓库的收货量等于其需求）
-        for j in range(len(warehouses)):
-            prob += pulp.lpSum([x[i,j] for i in range(len(factories))]) == demand[j]
-        
-        # 求解：CBC开源求解器，msg=0静默输出
-        prob.solve(pulp.PULP_CBC_CMD(msg=0))
-        
-        # 结果：读取运输矩阵与目标值
-        solution_matrix = np.zeros((len(factories), len(warehouses)))
-        for i in range(len(factories)):
-            for j in range(len(warehouses)):
-                solution_matrix[i][j] = x[i,j].varValue
-        
-        min_transport_cost = pulp.value(prob.objective)
-        
-        print("\n最优运输方案：")
-        solution_df = pd.DataFrame(solution_matrix, 
-                                 index=factories, 
-                                 columns=warehouses)
-        print(solution_df.round(1))
-        
-        print("\n运输成本分析：")
-        print(f"  最小运输成本：{min_transport_cost:.2f} 元")
+        lines.append("\n运输成本分析：")
+        lines.append(f"  最小运输成本：{min_transport_cost:.2f} 元")
         
         # 计算各路线成本：便于识别高成本路线与优化机会
-        print("\n主要运输路线：")
+        lines.append("\n主要运输路线：")
+        # np.argwhere直接给出有流量的 (i, j) 下标，仅遍历活跃路线
         route_details = []
-        for i in range(len(factories)):
-            for j in range(len(warehouses)):
-                if solution_matrix[i][j] > 0:
-                    route_cost = solution_matrix[i][j] * cost_matrix[i][j]
-                    route_details.append({
-                        'from': factories[i],
-                        'to': warehouses[j],
-                        'quantity': solution_matrix[i][j],
-                        'unit_cost': cost_matrix[i][j],
-                        'total_cost': route_cost
-                    })
-                    print(f"  {factories[i]} → {warehouses[j]}: "
-                          f"{solution_matrix[i][j]:.1f}吨, 成本: {route_cost:.2f}元")
+        for i, j in np.argwhere(solution_matrix > 0):
+            route_details.append({
+                'from': factories[i],
+                'to': warehouses[j],
+                'quantity': solution_matrix[i][j],
+                'unit_cost': cost_matrix[i][j],
+                'total_cost': route_cost_matrix[i][j]
+            })
+            lines.append(f"  {factories[i]} → {warehouses[j]}: "
+                         f"{solution_matrix[i][j]:.1f}吨, "
+                         f"成本: {route_cost_matrix[i][j]:.2f}元")
+        
+        # 一次性写出全部内容：stdout写调用从十余次降为一次
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # 保存结果以供后续可视化与报告
         self.results['basic'] = {
@@ -175,6 +199,7 @@ class TransportationProblemDemo:
             'demand': demand,
             'original_demand': original_demand,
             'cost_matrix': cost_matrix,
+            'lp_data': (c, A_eq, b_eq),
             'solution_matrix': solution_matrix,
             'min_cost': min_transport_cost,
             'route_details': route_details
@@ -188,9 +213,10 @@ class TransportationProblemDemo:
         
         作用：构建多索引运输模型（工厂×产品×市场），最小化总成本。
         语法要点：
-        - 决策变量 x[i,p,j] 表示工厂i的产品p送至市场j的数量
+        - 变量 x[i,p,j] 按行优先展平后用 scipy.optimize.linprog(method='highs')
+          在进程内一次求解，目标系数即展平的成本张量
         - 供应约束：每个工厂每种产品的总发货量 ≤ 供应
-        - 需求约束：每个市场每种产品的总收货量 ≥ 需求
+        - 需求约束：每个市场每种产品的总收货量 ≥ 需求（取负并入 A_ub）
         原理：仍为线性规划，但维度更高，适合展示结构化建模方法。
         """
         print("\n多产品运输问题")
@@ -223,70 +249,72 @@ class TransportationProblemDemo:
         ])
         
         print("供应信息：")
-        supply_df = pd.DataFrame(supply_matrix, index=factories, columns=products)
-        print(supply_df)
+        print(_format_matrix(supply_matrix, factories, products))
         
         print("\n需求信息：")
-        demand_df = pd.DataFrame(demand_matrix, index=markets, columns=products)
-        print(demand_df)
+        print(_format_matrix(demand_matrix, markets, products))
         
         print(f"\n各产品总供应量：P1={supply_matrix[:, 0].sum()}, P2={supply_matrix[:, 1].sum()}")
         print(f"各产品总需求量：P1={demand_matrix[:, 0].sum()}, P2={demand_matrix[:, 1].sum()}")
         
-        # 使用PuLP定义优化问题：最小化总运输成本
-        prob = pulp.LpProblem("多产品运输问题", pulp.LpMinimize)
-        
-        # 决策变量：从工厂i的产品p到市场j的运输量（非负连续）
-        x = {}
-        for i in range(len(factories)):
-            for p in range(len(products)):
-                for j in range(len(markets)):
-                    x[i,p,j] = pulp.LpVariable(f"x_{i}_{p}_{j}", lowBound=0)
-        
-        # 目标函数：最小化总运输成本 Σ c_{i,p,j} x_{i,p,j}
-        prob += pulp.lpSum([cost_tensor[i][p][j] * x[i,p,j] 
-                           for i in range(len(factories))
-                           for p in range(len(products))
-                           for j in range(len(markets))])
-        
-        # 约束条件：
-        # 1) 供应约束：每个工厂每种产品的供应量限制
-        for i in range(len(factories)):
-            for p in range(len(products)):
-                prob += pulp.lpSum([x[i,p,j] for j in range(len(markets))]) <= supply_matrix[i][p]
-        
-        # 2) 需求约束：每个市场每种产品的需求量满足
-        for j in range(len(markets)):
-            for p in range(len(products)):
-                prob += pulp.lpSum([x[i,p,j] for i in range(len(factories))]) >= demand_matrix[j][p]
+        # 维度只取一次长度，约束构建与结果还原共用
+        n_factories, n_products, n_markets = (len(factories), len(products),
+                                              len(markets))
+        n_vars = n_factories * n_products * n_markets
+        
+        # 展平为 x[i,p,j] → 下标 i*P*J + p*J + j 的LP，
+        # 直接用scipy的HiGHS在进程内求解，省去逐变量/逐约束的建模层：
+        # 目标系数就是展平的成本张量
+        c = cost_tensor.astype(np.float64).ravel()
+        
+        # 不等式约束统一写成 A_ub @ x <= b_ub：
+        # 供应行（每工厂每产品发货 ≤ 供应）系数为+1；
+        # 需求行（每市场每产品收货 ≥ 需求）两边取负后系数为-1
+        k = np.arange(n_vars)
+        j_idx = k % n_markets
+        p_idx = (k // n_markets) % n_products
+        rows = np.concatenate([
+            np.repeat(np.arange(n_factories * n_products), n_markets),
+            n_factories * n_products + j_idx * n_products + p_idx
+        ])
+        data = np.concatenate([np.ones(n_vars), -np.ones(n_vars)])
+        A_ub = csr_matrix((data, (rows, np.concatenate([k, k]))),
+                          shape=(n_factories * n_products
+                                 + n_markets * n_products, n_vars))
+        b_ub = np.concatenate([supply_matrix.ravel().astype(np.float64),
+                               -demand_matrix.ravel().astype(np.float64)])
         
-        # 求解：CBC开源求解器，msg=0静默输出
-        prob.solve(pulp.PULP_CBC_CMD(msg=0))
+        res = linprog(c, A_ub=A_ub, b_ub=b_ub, method='highs')
         
         # 结果
-        min_cost = pulp.value(prob.objective)
+        min_cost = res.fun
         
         print("\n最优运输方案：")
         print(f"  最小运输成本：{min_cost:.2f} 元")
         
         print("\n运输路线详情：")
+        # 解向量直接还原为三维运量张量，路线成本用张量元素积算完，
+        # 再用np.argwhere只遍历有流量的 (i, p, j) 组合
+        qty = res.x.reshape(n_factories, n_products, n_markets)
+        route_costs = qty * cost_tensor
+        
+        # 各产品的成本与运量聚合：按（工厂, 市场）轴一次归约并缓存，
+        # 可视化与报告直接复用，不再各自用字典累加
+        per_product_cost = route_costs.sum(axis=(0, 2))
+        per_product_qty = qty.sum(axis=(0, 2))
+        
         multi_route_details = []
-        for i in range(len(factories)):
-            for p in range(len(products)):
-                for j in range(len(markets)):
-                    quantity = x[i,p,j].varValue
-                    if quantity > 0:
-                        cost = quantity * cost_tensor[i][p][j]
-                        multi_route_details.append({
-                            'factory': factories[i],
-                            'product': products[p],
-                            'market': markets[j],
-                            'quantity': quantity,
-                            'unit_cost': cost_tensor[i][p][j],
-                            'total_cost': cost
-                        })
-                        print(f"  {factories[i]} {products[p]} → {markets[j]}: "
-                              f"{quantity:.1f}单位, 成本: {cost:.2f}元")
+        for i, p, j in np.argwhere(qty > 0):
+            multi_route_details.append({
+                'factory': factories[i],
+                'product': products[p],
+                'market': markets[j],
+                'quantity': qty[i, p, j],
+                'unit_cost': cost_tensor[i, p, j],
+                'total_cost': route_costs[i, p, j]
+            })
+            print(f"  {factories[i]} {products[p]} → {markets[j]}: "
+                  f"{qty[i, p, j]:.1f}单位, 成本: {route_costs[i, p, j]:.2f}元")
         
         # 保存多产品运输结果以供可视化与报告
         self.results['multi_product'] = {
@@ -297,6 +325,8 @@ class TransportationProblemDemo:
             'demand_matrix': demand_matrix,
             'cost_tensor': cost_tensor,
             'min_cost': min_cost,
+            'per_product_cost': per_product_cost,
+            'per_product_qty': per_product_qty,
             'route_details': multi_route_details
         }
         
@@ -313,6 +343,19 @@ class TransportationProblemDemo:
         
         print("\n生成可视化图表…")
         
+        # 延迟加载matplotlib并在首次绘图时配置中文字体：
+        # 只跑求解/报告的场景不必承担图形库导入与字体扫描的成本
+        import matplotlib.pyplot as plt
+        from font_config import setup_chinese_font
+        if not TransportationProblemDemo._font_ready:
+            font = setup_chinese_font()
+            # 显式钉死字体相关rcParams：首个figure创建时matplotlib的
+            # 惰性字体解析直接命中，不会再触发一次字体缓存查找
+            if font:
+                plt.rcParams['font.sans-serif'] = [font]
+            plt.rcParams['axes.unicode_minus'] = False
+            TransportationProblemDemo._font_ready = True
+        
         # 创建2x3子图布局，展示更全面的运输分析
         if 'multi_product' in self.results:
             fig, ((ax1, ax2, ax3), (ax4, ax5, ax6)) = plt.subplots(2, 3, figsize=(20, 12))
@@ -323,78 +366,65 @@ class TransportationProblemDemo:
             basic = self.results['basic']
             
             # 1. 运输网络图
-            import networkx as nx
-            G = nx.Graph()
+            # 不再为绘图构建NetworkX图：节点一次scatter、
+            # 全部边合成一个LineCollection批量提交，后端调用次数与边数无关
+            from matplotlib.collections import LineCollection
+            from matplotlib.colors import Normalize
             
-            # 添加节点
             factories = basic['factories'][:len(basic['cost_matrix'])]
             warehouses = basic['original_warehouses']
             
-            # 工厂节点（红色）
-            for factory in factories:
-                G.add_node(factory, node_type='factory')
-            
-            # 仓库节点（蓝色）
-            for warehouse in warehouses:
-                G.add_node(warehouse, node_type='warehouse')
-            
-            # 添加边（运输路线）
-            for detail in basic['route_details']:
-                if detail['quantity'] > 0:
-                    G.add_edge(detail['from'], detail['to'], 
-                              weight=detail['quantity'], 
-                              cost=detail['unit_cost'])
-            
-            # 绘制网络图
-            pos = {}
-            # 工厂位置（左侧）
-            for i, factory in enumerate(factories):
-                pos[factory] = (0, i * 2)
-            
-            # 仓库位置（右侧）
-            for i, warehouse in enumerate(warehouses):
-                pos[warehouse] = (3, i * 1.5)
-            
-            # 绘制节点
-            factory_nodes = [n for n in G.nodes() if n in factories]
-            warehouse_nodes = [n for n in G.nodes() if n in warehouses]
-            
-            nx.draw_networkx_nodes(G, pos, nodelist=factory_nodes, 
-                                 node_color='#FF6B6B', node_size=800, ax=ax1)
-            nx.draw_networkx_nodes(G, pos, nodelist=warehouse_nodes, 
-                                 node_color='#4ECDC4', node_size=800, ax=ax1)
-            
-            # 绘制边（运输路线）
-            edges = G.edges()
-            weights = [G[u][v]['weight'] for u, v in edges]
-            max_weight = max(weights) if weights else 1
-            
-            for (u, v) in edges:
-                weight = G[u][v]['weight']
-                width = (weight / max_weight) * 5 + 1
-                nx.draw_networkx_edges(G, pos, edgelist=[(u, v)], 
-                                     width=width, alpha=0.7, ax=ax1)
-            
-            # 添加标签
-            nx.draw_networkx_labels(G, pos, font_size=10, ax=ax1)
-            
-            # 添加边标签（运输量）
-            edge_labels = {(u, v): f'{G[u][v]["weight"]:.0f}' for u, v in edges}
-            nx.draw_networkx_edge_labels(G, pos, edge_labels, font_size=8, ax=ax1)
+            # 节点位置：工厂在左侧、仓库在右侧
+            pos = {factory: (0, i * 2) for i, factory in enumerate(factories)}
+            pos.update({warehouse: (3, i * 1.5)
+                        for i, warehouse in enumerate(warehouses)})
+            
+            # 绘制节点（工厂红色、仓库蓝绿色）
+            ax1.scatter([pos[f][0] for f in factories],
+                        [pos[f][1] for f in factories],
+                        c='#FF6B6B', s=800, zorder=2)
+            ax1.scatter([pos[w][0] for w in warehouses],
+                        [pos[w][1] for w in warehouses],
+                        c='#4ECDC4', s=800, zorder=2)
+            
+            # 绘制边（运输路线）：线宽按运输量归一
+            active_routes = [d for d in basic['route_details']
+                             if d['quantity'] > 0]
+            quantities = np.array([d['quantity'] for d in active_routes])
+            max_weight = quantities.max() if len(quantities) else 1
+            segments = [(pos[d['from']], pos[d['to']]) for d in active_routes]
+            widths = quantities / max_weight * 5 + 1
+            ax1.add_collection(LineCollection(segments, linewidths=widths,
+                                              colors='black', alpha=0.7,
+                                              zorder=1))
+            
+            # 添加节点标签与边标签（运输量）
+            for name, (px, py) in pos.items():
+                ax1.text(px, py, name, fontsize=10, ha='center', va='center',
+                         zorder=3)
+            for detail, ((x1, y1), (x2, y2)) in zip(active_routes, segments):
+                ax1.text((x1 + x2) / 2, (y1 + y2) / 2,
+                         f"{detail['quantity']:.0f}",
+                         fontsize=8, ha='center', va='center', zorder=3)
             
             ax1.set_title('运输网络图', fontsize=14, fontweight='bold')
             ax1.axis('off')
             
             # 2. 运输成本热力图
             original_cost_matrix = basic['cost_matrix'][:, :len(basic['original_warehouses'])]
-            im2 = ax2.imshow(original_cost_matrix, cmap='YlOrRd', aspect='auto')
-            
-            # 添加数值标注
-            for i in range(len(factories)):
-                for j in range(len(warehouses)):
-                    if i < len(original_cost_matrix) and j < len(original_cost_matrix[0]):
-                        text = ax2.text(j, i, f'{original_cost_matrix[i, j]:.0f}',
-                                       ha="center", va="center", color="black", fontweight='bold')
+            # 归一化对象提前按min/max算好传入，imshow不再自扫数据定范围
+            norm_cost = Normalize(vmin=original_cost_matrix.min(),
+                                  vmax=original_cost_matrix.max())
+            im2 = ax2.imshow(original_cost_matrix, cmap='YlOrRd',
+                             norm=norm_cost, aspect='auto')
+            
+            # 添加数值标注：坐标网格一次算好，逐格循环只剩文本创建
+            ys, xs = np.indices(original_cost_matrix.shape)
+            for yi, xi, val in zip(ys.ravel(), xs.ravel(),
+                                   original_cost_matrix.ravel()):
+                ax2.text(xi, yi, f'{val:.0f}',
+                         ha="center", va="center", color="black",
+                         fontweight='bold')
             
             ax2.set_xticks(range(len(warehouses)))
             ax2.set_xticklabels(warehouses, rotation=45)
@@ -407,15 +437,18 @@ class TransportationProblemDemo:
             
             # 3. 最优运输方案
             original_solution = basic['solution_matrix'][:len(original_cost_matrix), :len(basic['original_warehouses'])]
-            im3 = ax3.imshow(original_solution, cmap='Blues', aspect='auto')
-            
-            # 添加数值标注
-            for i in range(len(factories)):
-                for j in range(len(warehouses)):
-                    if i < len(original_solution) and j < len(original_solution[0]):
-                        if original_solution[i, j] > 0:
-                            text = ax3.text(j, i, f'{original_solution[i, j]:.0f}',
-                                           ha="center", va="center", color="white", fontweight='bold')
+            norm_sol = Normalize(vmin=0, vmax=original_solution.max())
+            im3 = ax3.imshow(original_solution, cmap='Blues',
+                             norm=norm_sol, aspect='auto')
+            
+            # 添加数值标注：布尔掩码只选有运量的格子，零格不创建Text艺术家
+            ys, xs = np.indices(original_solution.shape)
+            mask = original_solution > 0
+            for yi, xi, val in zip(ys[mask], xs[mask],
+                                   original_solution[mask]):
+                ax3.text(xi, yi, f'{val:.0f}',
+                         ha="center", va="center", color="white",
+                         fontweight='bold')
             
             ax3.set_xticks(range(len(warehouses)))
             ax3.set_xticklabels(warehouses, rotation=45)
@@ -462,21 +495,10 @@ class TransportationProblemDemo:
         if 'multi_product' in self.results:
             multi = self.results['multi_product']
             
-            # 5. 多产品运输成本对比
-            product_costs = {}
-            product_quantities = {}
-            
-            for detail in multi['route_details']:
-                product = detail['product']
-                if product not in product_costs:
-                    product_costs[product] = 0
-                    product_quantities[product] = 0
-                product_costs[product] += detail['total_cost']
-                product_quantities[product] += detail['quantity']
-            
-            products = list(product_costs.keys())
-            costs = list(product_costs.values())
-            quantities = list(product_quantities.values())
+            # 5. 多产品运输成本对比（直接读取求解时缓存的聚合数组）
+            products = multi['products']
+            costs = multi['per_product_cost']
+            quantities = multi['per_product_qty']
             
             # 成本对比
             bars5 = ax5.bar(products, costs, color=['#FF6B6B', '#4ECDC4', '#45B7D1'])
@@ -486,7 +508,7 @@ class TransportationProblemDemo:
             ax5.grid(True, alpha=0.3)
             
             # 添加成本标签和百分比
-            total_cost = sum(costs)
+            total_cost = costs.sum()
             for bar, cost in zip(bars5, costs):
                 percentage = cost / total_cost * 100
                 ax5.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 10,
@@ -494,7 +516,7 @@ class TransportationProblemDemo:
                         ha='center', va='bottom')
             
             # 6. 产品运输效率分析
-            efficiency = [cost/qty if qty > 0 else 0 for cost, qty in zip(costs, quantities)]
+            efficiency = np.where(quantities > 0, costs / quantities, 0)
             
             bars6 = ax6.bar(products, efficiency, color=['#32CD32', '#FFD700', '#FF6347'])
             ax6.set_title('产品运输效率 (元/单位)', fontsize=14, fontweight='bold')
@@ -526,15 +548,18 @@ class TransportationProblemDemo:
         
         plt.tight_layout()
         save_path = os.path.join(BASE_DIR, 'transportation_results.png')
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        # 布局已由tight_layout整理，保存时不再用bbox_inches='tight'
+        # 触发一次额外的渲染遍历来测量紧致包围盒
+        plt.savefig(save_path, dpi=300)
         plt.close(fig)
         
         print("可视化图表已保存为 'transportation_results.png'")
     
     def cost_sensitivity_analysis(self):
         """运输成本敏感性分析
-        作用：在不重新优化的简化前提下评估关键路线成本变化对总成本的影响，作为直觉参考。
-        说明：严谨分析需在成本变动下重新求解模型，这里为教学简化演示。
+        作用：对关键路线的单位成本施加扰动并重新求解模型，给出真实的总成本变化。
+        说明：求解时缓存的 (c, A_eq, b_eq) 在此复用，每次扰动只改一个目标系数；
+        HiGHS对这类微型LP的重解近乎瞬时，因此可以给出精确结果而非算术近似。
         """
         if 'basic' not in self.results:
             print("请先运行基础运输问题求解")
@@ -545,6 +570,8 @@ class TransportationProblemDemo:
         
         basic = self.results['basic']
         base_cost = basic['min_cost']
+        c, A_eq, b_eq = basic['lp_data']
+        n = len(basic['warehouses'])
         
         # 分析关键路线成本变化的影响
         print("关键路线成本变化影响：")
@@ -552,13 +579,19 @@ class TransportationProblemDemo:
         for route in basic['route_details'][:3]:  # 分析前3条主要路线
             print(f"\n  {route['from']} → {route['to']} 路线:")
             
+            # 该路线对应的展平变量下标（行优先 i*n+j）
+            k = (basic['factories'].index(route['from']) * n
+                 + basic['warehouses'].index(route['to']))
+            
             for cost_change in [-20, -10, 10, 20]:  # 成本变化百分比
-                # 这里简化处理，实际应该重新求解整个问题
-                estimated_cost_change = route['total_cost'] * cost_change / 100
-                new_total_cost = base_cost + estimated_cost_change
+                # 只扰动目标系数并重新求解：约束矩阵保持不变
+                c_new = c.copy()
+                c_new[k] = c[k] * (1 + cost_change / 100)
+                res = linprog(c_new, A_eq=A_eq, b_eq=b_eq, method='highs')
+                actual_change = res.fun - base_cost
                 
-                print(f"    成本{cost_change:+d}% → 预估总成本：{new_total_cost:.2f} 元 "
-                      f"(变化：{estimated_cost_change:+.2f})")
+                print(f"    成本{cost_change:+d}% → 重解总成本：{res.fun:.2f} 元 "
+                      f"(变化：{actual_change:+.2f})")
     
     def generate_report(self):
         """生成详细报告
@@ -569,71 +602,66 @@ class TransportationProblemDemo:
             print("请先运行求解方法")
             return
         
-        print("\n" + "="*50)
-        print("运输问题优化报告")
-        print("="*50)
+        lines = ["\n" + "="*50, "运输问题优化报告", "="*50]
         
         if 'basic' in self.results:
             basic = self.results['basic']
-            print("\n基础运输问题：")
-            print(f"  • 优化目标：最小化运输成本")
-            print(f"  • 工厂数量：{len(basic['factories'])}")
-            print(f"  • 仓库数量：{len(basic['original_warehouses'])}")
-            print(f"  • 最小运输成本：{basic['min_cost']:.2f} 元")
+            lines.append("\n基础运输问题：")
+            lines.append(f"  • 优化目标：最小化运输成本")
+            lines.append(f"  • 工厂数量：{len(basic['factories'])}")
+            lines.append(f"  • 仓库数量：{len(basic['original_warehouses'])}")
+            lines.append(f"  • 最小运输成本：{basic['min_cost']:.2f} 元")
             
-            print("\n运输方案统计：")
+            lines.append("\n运输方案统计：")
             total_quantity = sum(detail['quantity'] for detail in basic['route_details'])
-            print(f"  • 总运输量：{total_quantity:.1f} 吨")
-            print(f"  • 平均运输成本：{basic['min_cost']/total_quantity:.2f} 元/吨")
-            print(f"  • 活跃路线数：{len(basic['route_details'])}")
+            lines.append(f"  • 总运输量：{total_quantity:.1f} 吨")
+            lines.append(f"  • 平均运输成本：{basic['min_cost']/total_quantity:.2f} 元/吨")
+            lines.append(f"  • 活跃路线数：{len(basic['route_details'])}")
             
             # 找出成本最高和最低的路线
             if basic['route_details']:
                 max_cost_route = max(basic['route_details'], key=lambda x: x['unit_cost'])
                 min_cost_route = min(basic['route_details'], key=lambda x: x['unit_cost'])
                 
-                print("\n路线成本分析：")
-                print(f"  • 最高成本路线: {max_cost_route['from']} → {max_cost_route['to']} "
+                lines.append("\n路线成本分析：")
+                lines.append(f"  • 最高成本路线: {max_cost_route['from']} → {max_cost_route['to']} "
                       f"({max_cost_route['unit_cost']} 元/吨)")
-                print(f"  • 最低成本路线: {min_cost_route['from']} → {min_cost_route['to']} "
+                lines.append(f"  • 最低成本路线: {min_cost_route['from']} → {min_cost_route['to']} "
                       f"({min_cost_route['unit_cost']} 元/吨)")
         
         if 'multi_product' in self.results:
             multi = self.results['multi_product']
-            print("\n多产品运输问题：")
-            print(f"  • 工厂数量：{len(multi['factories'])}")
-            print(f"  • 产品种类：{len(multi['products'])}")
-            print(f"  • 市场数量：{len(multi['markets'])}")
-            print(f"  • 最小运输成本：{multi['min_cost']:.2f} 元")
-            
-            # 各产品的运输成本分析
-            product_costs = {}
-            for detail in multi['route_details']:
-                product = detail['product']
-                if product not in product_costs:
-                    product_costs[product] = 0
-                product_costs[product] += detail['total_cost']
-            
-            print("\n各产品运输成本：")
-            for product, cost in product_costs.items():
+            lines.append("\n多产品运输问题：")
+            lines.append(f"  • 工厂数量：{len(multi['factories'])}")
+            lines.append(f"  • 产品种类：{len(multi['products'])}")
+            lines.append(f"  • 市场数量：{len(multi['markets'])}")
+            lines.append(f"  • 最小运输成本：{multi['min_cost']:.2f} 元")
+            
+            # 各产品的运输成本分析（读取求解时缓存的聚合数组）
+            lines.append("\n各产品运输成本：")
+            for product, cost in zip(multi['products'],
+                                     multi['per_product_cost']):
                 percentage = cost / multi['min_cost'] * 100
-                print(f"  • {product}: {cost:.2f} 元 ({percentage:.1f}%)")
+                lines.append(f"  • {product}: {cost:.2f} 元 ({percentage:.1f}%)")
         
-        print("\n优化建议：")
+        lines.append("\n优化建议：")
         if 'basic' in self.results:
             basic = self.results['basic']
             if basic['route_details']:
                 # 建议优化高成本路线
                 high_cost_routes = [r for r in basic['route_details'] if r['unit_cost'] > 10]
                 if high_cost_routes:
-                    print(f"  • 考虑优化高成本路线，寻找替代运输方案")
+                    lines.append(f"  • 考虑优化高成本路线，寻找替代运输方案")
                 
                 # 建议增加低成本路线的利用
                 low_cost_routes = [r for r in basic['route_details'] if r['unit_cost'] < 8]
                 if low_cost_routes:
-                    print(f"  • 充分利用低成本路线，提高运输效率")
+                    lines.append(f"  • 充分利用低成本路线，提高运输效率")
+        
+        lines.append("="*50)
         
-        print("="*50)
+        # 一次性写出全部内容：stdout写调用从数十次降为一次
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """主函数